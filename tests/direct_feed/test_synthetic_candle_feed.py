@@ -1,8 +1,9 @@
 import pandas as pd
+import pytest
 
 from eth_defi.price_oracle.oracle import TrustedStablecoinOracle, FixedPriceOracle
 
-from tradingstrategy.direct_feed.candle_feed import CandleFeed
+from tradingstrategy.direct_feed.candle_feed import CandleFeed, RingBufferCandleFeed
 from eth_defi.event_reader.reorganisation_monitor import MockChainAndReorganisationMonitor
 from tradingstrategy.direct_feed.synthetic_feed import SyntheticTradeFeed
 from tradingstrategy.direct_feed.timeframe import Timeframe
@@ -260,3 +261,64 @@ def test_candle_feed_two_pairs():
     assert candle_feed.get_last_block_number() == 201
     flat = candle_feed.candle_df.reset_index(drop=True)
     assert len(flat) == 82
+
+
+def test_ring_buffer_candle_feed():
+    """Keep only the latest candles per pair."""
+
+    mock_chain = MockChainAndReorganisationMonitor(block_duration_seconds=12, check_depth=100)
+    mock_chain.produce_blocks(100)
+    timeframe = Timeframe("1min")
+
+    feed = SyntheticTradeFeed(
+        ["ETH-USD"],
+        {"ETH-USD": TrustedStablecoinOracle()},
+        mock_chain,
+        timeframe=timeframe,
+        min_amount=-50,
+        max_amount=50,
+    )
+
+    full_candle_feed = CandleFeed(
+        ["ETH-USD"],
+        timeframe=timeframe,
+    )
+
+    ring_candle_feed = RingBufferCandleFeed(
+        ["ETH-USD"],
+        timeframe=timeframe,
+        capacity=10,
+    )
+
+    delta = feed.backfill_buffer(100, None)
+    full_candle_feed.apply_delta(delta)
+    ring_candle_feed.apply_delta(delta)
+
+    candles = ring_candle_feed.get_candles_by_pair("ETH-USD")
+    full_candles = full_candle_feed.get_candles_by_pair("ETH-USD")
+    assert len(candles) == 10
+    assert list(candles.columns) == list(full_candles.columns)
+    assert candles.index[-1] == pd.Timestamp('1970-01-01 00:20:00')
+    assert (candles.index == full_candles.index[-10:]).all()
+    assert candles["close"].tolist() == pytest.approx(full_candles["close"].iloc[-10:].astype(float).tolist())
+    assert ring_candle_feed.get_last_block_number() == 100
+
+    # Fork the chain
+    mock_chain.produce_fork(70, fork_marker="0x8888")
+    delta = feed.perform_duty_cycle()
+    full_candle_feed.apply_delta(delta)
+    ring_candle_feed.apply_delta(delta)
+    assert delta.reorg_detected
+
+    # Add 100 blocks
+    mock_chain.produce_blocks(100)
+    delta = feed.perform_duty_cycle()
+    full_candle_feed.apply_delta(delta)
+    ring_candle_feed.apply_delta(delta)
+
+    candles = ring_candle_feed.get_candles_by_pair("ETH-USD")
+    full_candles = full_candle_feed.get_candles_by_pair("ETH-USD")
+    assert len(candles) == 10
+    assert (candles.index == full_candles.index[-10:]).all()
+    assert candles["close"].tolist() == pytest.approx(full_candles["close"].iloc[-10:].astype(float).tolist())
+    assert ring_candle_feed.get_last_block_number() == full_candle_feed.get_last_block_number()
@@ -1,9 +1,14 @@
 """Synthetic candle data tests."""
 
+import datetime
+
+import numpy as np
 import pandas as pd
 import pytest
 
-from tradingstrategy.candle import Candle, GroupedCandleUniverse, CandleSampleUnavailable
+from tradingstrategy.candle import Candle, GroupedCandleUniverse, CandleSampleUnavailable, HAS_NUMBA, \
+    _find_latest_within_tolerance
+from tradingstrategy.utils.groupeduniverse import resample_candles
 
 
 @pytest.fixture()
@@ -13,15 +18,11 @@ def synthetic_candles() -> pd.DataFrame:
     Contains candle data for one trading pair (pair_id=1)
     """
 
-    data = [
-        Candle.generate_synthetic_sample(1, pd.Timestamp("2020-01-01"), 100.10),
-        Candle.generate_synthetic_sample(1, pd.Timestamp("2020-02-01"), 100.50),
-        Candle.generate_synthetic_sample(1, pd.Timestamp("2020-03-01"), 101.10),
-        Candle.generate_synthetic_sample(1, pd.Timestamp("2020-09-01"), 101.80),
-    ]
-
-    df = pd.DataFrame(data, columns=Candle.DATAFRAME_FIELDS)
-    return df
+    return Candle.generate_synthetic_frame(
+        1,
+        pd.DatetimeIndex(["2020-01-01", "2020-02-01", "2020-03-01", "2020-09-01"]),
+        np.array([100.10, 100.50, 101.10, 101.80]),
+    )
 
 
 def test_generate_candle_data(synthetic_candles):
@@ -37,6 +38,20 @@ def test_generate_candle_data(synthetic_candles):
     assert df.loc[pd.Timestamp("2020-02-01")]["close"] == pytest.approx(100.50)
 
 
+def test_generate_synthetic_frame(synthetic_candles):
+    """Vectorised synthetic candles match the per-row generated ones."""
+
+    data = [
+        Candle.generate_synthetic_sample(1, pd.Timestamp("2020-01-01"), 100.10),
+        Candle.generate_synthetic_sample(1, pd.Timestamp("2020-02-01"), 100.50),
+        Candle.generate_synthetic_sample(1, pd.Timestamp("2020-03-01"), 101.10),
+        Candle.generate_synthetic_sample(1, pd.Timestamp("2020-09-01"), 101.80),
+    ]
+
+    df = pd.DataFrame(data, columns=Candle.DATAFRAME_FIELDS)
+    pd.testing.assert_frame_equal(synthetic_candles, df)
+
+
 def test_get_price_with_tolerance(synthetic_candles):
     """Correctly get a price within a tolerance."""
 
@@ -60,6 +75,29 @@ def test_get_price_with_tolerance(synthetic_candles):
     assert test_price == pytest.approx(100.50)
     assert distance == pd.Timedelta("5m")
 
+    # Plain float even if the candles are stored as float32
+    assert type(test_price) == float
+
+
+def test_get_price_with_tolerance_datetime(synthetic_candles):
+    """Price look ups accept plain datetime and timedelta."""
+
+    universe = GroupedCandleUniverse(synthetic_candles)
+
+    test_price, distance = universe.get_price_with_tolerance(
+        pair_id=1,
+        when=datetime.datetime(2020, 2, 1, 5),
+        tolerance=datetime.timedelta(days=1))
+    assert test_price == pytest.approx(100.50)
+    assert distance == pd.Timedelta("5h")
+
+    prices, distances = universe.get_prices_with_tolerance(
+        pair_id=1,
+        whens=pd.DatetimeIndex([datetime.datetime(2020, 2, 1, 5)]),
+        tolerance=datetime.timedelta(days=1))
+    assert prices.iloc[0] == pytest.approx(100.50)
+    assert distances.iloc[0] == pd.Timedelta("5h")
+
 
 def test_get_price_not_within_tolerance(synthetic_candles):
     """Test creation of candles."""
@@ -78,6 +116,84 @@ def test_get_price_not_within_tolerance(synthetic_candles):
             when=pd.Timestamp("2020-01-01 00:05"),
             tolerance=pd.Timedelta(1, "m"))
 
+    # Before the first candle
+    with pytest.raises(CandleSampleUnavailable):
+        universe.get_price_with_tolerance(
+            pair_id=1,
+            when=pd.Timestamp("2019-12-31"),
+            tolerance=pd.Timedelta(30, "d"))
+
+    # A pair with a single candle
+    universe = GroupedCandleUniverse(synthetic_candles.iloc[:1])
+    with pytest.raises(CandleSampleUnavailable):
+        universe.get_price_with_tolerance(
+            pair_id=1,
+            when=pd.Timestamp("2019-12-31"),
+            tolerance=pd.Timedelta(30, "d"))
+
+
+@pytest.mark.skipif(not HAS_NUMBA, reason="Numba is not installed")
+def test_find_latest_within_tolerance_jit():
+    """Numba compiled price look up kernel matches the plain Python version."""
+
+    timestamps = pd.DatetimeIndex(["2020-01-01", "2020-02-01", "2020-03-01"]).asi8
+    day = pd.Timedelta(1, "d").value
+
+    cases = [
+        # Within the tolerance
+        (pd.Timestamp("2020-02-01 12:00").value, day),
+        # Too far from any candle
+        (pd.Timestamp("2020-02-05").value, day),
+        # Before the first candle
+        (pd.Timestamp("2019-12-31").value, 30 * day),
+        # Exact match
+        (pd.Timestamp("2020-03-01").value, 0),
+    ]
+
+    for target, tolerance in cases:
+        expected = _find_latest_within_tolerance.py_func(timestamps, target, tolerance)
+        assert _find_latest_within_tolerance(timestamps, target, tolerance) == expected
+
+    assert [_find_latest_within_tolerance(timestamps, *c)[0] for c in cases] == [1, -1, -1, 2]
+
+
+def test_get_prices_with_tolerance(synthetic_candles):
+    """Get prices for multiple timestamps in one go."""
+
+    universe = GroupedCandleUniverse(synthetic_candles)
+
+    whens = pd.DatetimeIndex([
+        "2020-01-01",
+        "2020-01-02",
+        "2020-01-05",
+        "2020-02-01 00:05",
+        "2019-12-31",
+    ])
+
+    prices, distances = universe.get_prices_with_tolerance(pair_id=1, whens=whens, tolerance=pd.Timedelta(1, "d"))
+
+    assert prices.iloc[0] == pytest.approx(100.10)
+    assert distances.iloc[0] == pd.Timedelta(0)
+
+    assert prices.iloc[1] == pytest.approx(100.10)
+    assert distances.iloc[1] == pd.Timedelta("1d")
+
+    # Not within the tolerance
+    assert pd.isna(prices.iloc[2])
+    assert pd.isna(distances.iloc[2])
+
+    assert prices.iloc[3] == pytest.approx(100.50)
+    assert distances.iloc[3] == pd.Timedelta("5m")
+
+    # Before the first candle
+    assert pd.isna(prices.iloc[4])
+    assert pd.isna(distances.iloc[4])
+
+    # Must agree with the single timestamp look up
+    price, distance = universe.get_price_with_tolerance(pair_id=1, when=whens[3], tolerance=pd.Timedelta(1, "d"))
+    assert prices.iloc[3] == price
+    assert distances.iloc[3] == distance
+
 
 def test_get_single_pair_data_allow_current(synthetic_candles):
     """Check for our forward-looking bias mitigation."""
@@ -89,3 +205,30 @@ def test_get_single_pair_data_allow_current(synthetic_candles):
 
     candles = universe.get_single_pair_data(timestamp=pd.Timestamp("2020-09-01"), allow_current=True)
     assert candles.iloc[-1]["timestamp"] == pd.Timestamp("2020-09-01")
+
+    # Plain datetime works as well
+    candles = universe.get_single_pair_data(timestamp=datetime.datetime(2020, 9, 1), allow_current=True)
+    assert candles.iloc[-1]["timestamp"] == pd.Timestamp("2020-09-01")
+
+
+def test_pair_id_stays_integer():
+    """Grouping by pair does not change the pair_id column users see."""
+
+    timestamps = pd.date_range("2020-01-01", periods=10, freq="D")
+    df = pd.concat([
+        Candle.generate_synthetic_frame(2, timestamps, np.linspace(100, 110, 10)),
+        Candle.generate_synthetic_frame(1, timestamps[:3], np.linspace(200, 210, 3)),
+    ])
+
+    universe = GroupedCandleUniverse(df)
+    assert list(universe.get_pair_ids()) == [1, 2]
+
+    candles = universe.get_candles_by_pair(2)
+    assert pd.api.types.is_integer_dtype(candles["pair_id"])
+
+    weekly = resample_candles(candles, pd.Timedelta(days=7))
+    assert (weekly["pair_id"] == 2).all()
+
+    # Pair 1 has no candles in the range, so it does not get a group
+    groups = universe.iterate_samples_by_pair_range(pd.Timestamp("2020-01-05"), pd.Timestamp("2020-01-10"))
+    assert [(pair_id, len(group)) for pair_id, group in groups] == [(2, 6)]
@@ -15,8 +15,10 @@ For more information about candles see :term:`candle` in glossary.
 
 import datetime
 from dataclasses import dataclass
-from typing import List, Optional, Tuple, TypedDict, Collection, Iterable
+from functools import cached_property
+from typing import List, Optional, Tuple, TypedDict, Collection, Iterable, Dict
 
+import numpy as np
 import pandas as pd
 import pyarrow as pa
 from dataclasses_json import dataclass_json
@@ -26,15 +28,48 @@ from tradingstrategy.types import UNIXTimestamp, USDollarAmount, BlockNumber, Pr
     RawChainId
 from tradingstrategy.utils.groupeduniverse import PairGroupedUniverse
 
-
-# Preconstructed pd.Tiemdelta for optimisation
-_ZERO_TIMEDELTA = pd.Timedelta(0)
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
 
 class CandleSampleUnavailable(Exception):
     """We tried to look up price for a trading pair, but count not find a candle close to the timestamp."""
 
 
+def _find_latest_within_tolerance(timestamps: np.ndarray, target: int, tolerance: int) -> Tuple[int, int]:
+    """Find the latest timestamp at or before the target, within the tolerance.
+
+    Plain NumPy code that gets JIT compiled with Numba if it is installed,
+    see :py:data:`HAS_NUMBA`. The compiled version releases GIL.
+
+    :param timestamps:
+        Sorted int64 nanosecond timestamps
+
+    :param target:
+        Timestamp we look for, as nanoseconds
+
+    :param tolerance:
+        Maximum look back, as nanoseconds
+
+    :return:
+        (index, distance in nanoseconds) tuple.
+        Index is -1 if there is no timestamp within the tolerance.
+    """
+    idx = np.searchsorted(timestamps, target, side="right") - 1
+    if idx >= 0:
+        distance = target - timestamps[idx]
+        if distance <= tolerance:
+            return idx, distance
+    return -1, 0
+
+
+if HAS_NUMBA:
+    _find_latest_within_tolerance = njit(cache=True, nogil=True)(_find_latest_within_tolerance)
+
+
 @dataclass_json
 @dataclass
 class Candle:
@@ -256,6 +291,68 @@ class Candle:
             "sell_volume": 0,
         }
 
+    @classmethod
+    def generate_synthetic_frame(
+            cls,
+            pair_id: int,
+            timestamps: pd.DatetimeIndex,
+            prices: np.ndarray) -> pd.DataFrame:
+        """Generate a candle dataframe for a single pair.
+
+        Vectorised version of :py:meth:`generate_synthetic_sample`
+        for generating a lot of candles for testing.
+
+        All open/close/high/low set to the same price.
+        Exchange rate is 1.0. Other data set to zero.
+
+        Example:
+
+        .. code-block:: python
+
+            df = Candle.generate_synthetic_frame(
+                1,
+                pd.DatetimeIndex(["2020-01-01", "2020-02-01"]),
+                np.array([100.10, 100.50]),
+            )
+            universe = GroupedCandleUniverse(df)
+
+        :param pair_id:
+            Trading pair id for all candles
+
+        :param timestamps:
+            Candle timestamps
+
+        :param prices:
+            Price for each candle
+
+        :return:
+            DataFrame with :py:attr:`DATAFRAME_FIELDS` columns
+        """
+        timestamps = pd.DatetimeIndex(timestamps)
+        prices = np.asarray(prices, dtype="float64")
+        count = len(timestamps)
+        assert len(prices) == count, f"Got {count} timestamps and {len(prices)} prices"
+
+        # Same dtypes as generate_synthetic_sample() gives
+        zeros = np.zeros(count, dtype="int64")
+
+        return pd.DataFrame({
+            "pair_id": np.full(count, pair_id),
+            "timestamp": timestamps.values,
+            "exchange_rate": np.ones(count),
+            "open": prices,
+            "close": prices,
+            "high": prices,
+            "low": prices,
+            "buys": zeros,
+            "sells": zeros,
+            "volume": zeros,
+            "buy_volume": zeros,
+            "sell_volume": zeros,
+            "avg": zeros,
+            "start_block": zeros,
+            "end_block": zeros,
+        }, columns=cls.DATAFRAME_FIELDS)
 
 
 @dataclass_json
@@ -276,6 +373,22 @@ class CandleResult:
         self.candles.sort(key=lambda c: c.timestamp)
 
 
+@dataclass(slots=True)
+class PairCandleArrays:
+    """Candles of a single trading pair as NumPy arrays.
+
+    Struct-of-arrays presentation of the candle data,
+    so that price look ups do not need to go through
+    Pandas index machinery.
+    """
+
+    #: Candle open timestamps as UNIX nanoseconds, sorted ascending
+    timestamps: np.ndarray
+
+    #: OHLC column name -> price array aligned with :py:attr:`timestamps`
+    prices: Dict[str, np.ndarray]
+
+
 class GroupedCandleUniverse(PairGroupedUniverse):
     """A candle universe where each trading pair has its own candles.
 
@@ -309,6 +422,86 @@ class GroupedCandleUniverse(PairGroupedUniverse):
 
     """
 
+    #: Column word sizes we use for in-memory candle data.
+    #:
+    #: Same as our Parquet files, see :py:meth:`Candle.to_pyarrow_schema`.
+    #: Hand-written and JSON data would otherwise be 64-bit.
+    COMPACT_COLUMN_TYPES = {
+        "pair_id": "uint32",
+        "open": "float32",
+        "high": "float32",
+        "low": "float32",
+        "close": "float32",
+    }
+
+    def __init__(self, df: pd.DataFrame, *args, **kwargs):
+        """See :py:class:`tradingstrategy.utils.groupeduniverse.PairGroupedUniverse` for the arguments."""
+        assert isinstance(df, pd.DataFrame)
+
+        # Halve the memory bandwidth needed to scan the candles.
+        # No-op for the columns that are already in the right format.
+        df = df.astype({c: t for c, t in self.COMPACT_COLUMN_TYPES.items() if c in df.columns}, copy=False)
+
+        super().__init__(df, *args, **kwargs)
+
+    def get_pair_grouper(self) -> pd.Categorical:
+        """Group candles by pair id categorical codes.
+
+        The pair set is fixed for the lifetime of the universe,
+        so grouping works on 8-bit or 16-bit codes and does not need to hash the ids.
+        The `pair_id` column itself stays integer.
+        Ordered, so that groupby(observed=True) iterates pairs in id order.
+        """
+        pair_ids = self.df["pair_id"]
+        return pd.Categorical(pair_ids, categories=np.sort(pair_ids.unique()), ordered=True)
+
+    @cached_property
+    def pair_arrays(self) -> Dict[PrimaryKey, PairCandleArrays]:
+        """Pair id -> candle arrays for fast price look ups.
+
+        Split the candle data to per-pair NumPy arrays on the first access.
+        Universes that never do price look ups do not pay
+        for the sort or the extra copy of the columns.
+
+        Sort all candles by (pair, timestamp), so that each pair
+        is a contiguous range, and slice the columns by these ranges.
+        """
+        df = self.df
+        if len(df) == 0:
+            return {}
+
+        price_columns = [c for c in ("open", "high", "low", "close") if c in df.columns]
+
+        pair_ids = df["pair_id"].to_numpy()
+        timestamps = df[self.timestamp_column].to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+        order = np.lexsort((timestamps, pair_ids))
+        pair_ids = pair_ids[order]
+        timestamps = timestamps[order]
+        prices = {c: df[c].to_numpy()[order] for c in price_columns}
+
+        unique_pair_ids, starts = np.unique(pair_ids, return_index=True)
+        ends = np.append(starts[1:], len(pair_ids))
+
+        return {
+            pair_id: PairCandleArrays(
+                timestamps=timestamps[start:end],
+                prices={c: a[start:end] for c, a in prices.items()},
+            )
+            for pair_id, start, end in zip(unique_pair_ids.tolist(), starts, ends)
+        }
+
+    def get_pair_arrays(self, pair_id: PrimaryKey) -> PairCandleArrays:
+        """Get candles for a single pair as NumPy arrays.
+
+        :raise KeyError:
+            If we do not have data for pair_id
+        """
+        try:
+            return self.pair_arrays[pair_id]
+        except KeyError as e:
+            raise KeyError(f"No OHLC samples for pair id {pair_id} in {self}") from e
+
     def get_candle_count(self) -> int:
         """Return the dataset size - how many candles total"""
         return self.get_sample_count()
@@ -451,30 +644,25 @@ class GroupedCandleUniverse(PairGroupedUniverse):
 
         assert kind in ("open", "close", "high", "low"), f"Got kind: {kind}"
 
-        last_allowed_timestamp = when - tolerance
-
-        candles_per_pair = self.get_candles_by_pair(pair_id)
-        assert candles_per_pair is not None, f"No candle data available for pair {pair_id}"
+        # Also accept datetime.datetime and datetime.timedelta
+        when = pd.Timestamp(when)
+        tolerance = pd.Timedelta(tolerance)
 
-        samples_per_kind = candles_per_pair[kind]
-
-        # Look up all the candles before the cut off timestamp.
-        # Assumes data is sorted by timestamp column,
-        # so our "closest time" candles should be the last of this lookup.
-        # TODO: self.timestamp_column is no longer needed after we drop QSTrader support,
-        # it is legacy. In the future use hardcoded "timestamp" column name.
-        timestamp_column = candles_per_pair[self.timestamp_column]
-        latest_or_equal_sample = candles_per_pair.loc[timestamp_column <= when].iloc[-1]
+        last_allowed_timestamp = when - tolerance
 
-        # Check if the last sample before the cut off is within time range our tolerance
-        candle_timestamp = latest_or_equal_sample[self.timestamp_column]
+        arrays = self.get_pair_arrays(pair_id)
 
-        distance = when - candle_timestamp
-        assert distance >= _ZERO_TIMEDELTA, f"Somehow we managed to get a candle timestamp {candle_timestamp} that is newer than asked {when}"
+        # Binary search the latest candle at or before the timestamp.
+        # We never look into the future, so we do not
+        # introduce forward-looking bias here.
+        idx, distance_ns = _find_latest_within_tolerance(arrays.timestamps, when.value, tolerance.value)
 
-        if candle_timestamp >= last_allowed_timestamp:
+        if idx != -1:
             # Return the chosen price column of the sample
-            return latest_or_equal_sample[kind], distance
+            return float(arrays.prices[kind][idx]), pd.Timedelta(distance_ns)
+
+        candles_per_pair = self.get_candles_by_pair(pair_id)
+        samples_per_kind = candles_per_pair[kind]
 
         # Try to be helpful with the errors here,
         # so one does not need to open ipdb to inspect faulty data
@@ -482,7 +670,7 @@ class GroupedCandleUniverse(PairGroupedUniverse):
             first_sample = candles_per_pair.iloc[0]
             second_sample = candles_per_pair.iloc[1]
             last_sample = candles_per_pair.iloc[-1]
-        except KeyError:
+        except (KeyError, IndexError):
             raise CandleSampleUnavailable(
                 f"Could not find any candles for pair {pair_id}, value kind '{kind}', between {when} - {last_allowed_timestamp}\n"
                 f"Could not figure out existing data range. Has {len(samples_per_kind)} samples."
@@ -497,6 +685,69 @@ class GroupedCandleUniverse(PairGroupedUniverse):
             f"Try to increase look back perid in your code."
             )
 
+    def get_prices_with_tolerance(self,
+                                  pair_id: PrimaryKey,
+                                  whens: pd.DatetimeIndex,
+                                  tolerance: pd.Timedelta,
+                                  kind="close") -> Tuple[pd.Series, pd.Series]:
+        """Get prices for a trading pair at multiple timepoints in one go.
+
+        Batch version of :py:meth:`get_price_with_tolerance` for
+        backtests and sweeps that need prices for a lot of timestamps.
+
+        Example:
+
+        .. code-block:: python
+
+            whens = pd.DatetimeIndex(["2020-01-02", "2020-01-05", "2020-02-01 00:05"])
+            prices, distances = universe.get_prices_with_tolerance(
+                pair_id=1,
+                whens=whens,
+                tolerance=pd.Timedelta(1, "d"))
+
+            # 2020-01-05 is too far from any candle
+            assert np.isnan(prices.iloc[1])
+            assert pd.isna(distances.iloc[1])
+
+        :param pair_id:
+            Trading pair id
+
+        :param whens:
+            Timestamps to query
+
+        :param tolerance:
+            How far to the past we look for a candle for each timestamp.
+            See :py:meth:`get_price_with_tolerance`.
+
+        :param kind:
+            One of OHLC data points: "open", "close", "low", "high"
+
+        :return:
+            Return (prices, delays) tuple of series indexed by `whens`.
+            If there was no candle within the tolerance for a timestamp,
+            its price is `NaN` and delay is `NaT`.
+        """
+
+        assert kind in ("open", "close", "high", "low"), f"Got kind: {kind}"
+        assert isinstance(whens, pd.DatetimeIndex), f"Got whens: {whens.__class__}"
+
+        tolerance = pd.Timedelta(tolerance)
+
+        arrays = self.get_pair_arrays(pair_id)
+        timestamps = arrays.timestamps
+
+        whens_ns = whens.asi8
+        idx = np.searchsorted(timestamps, whens_ns, side="right") - 1
+        distances_ns = whens_ns - timestamps.take(idx.clip(min=0))
+        found = (idx >= 0) & (distances_ns <= tolerance.value)
+
+        prices = np.full(len(whens), np.nan)
+        prices[found] = arrays.prices[kind].take(idx[found])
+
+        distances = np.full(len(whens), np.timedelta64("NaT"), dtype="timedelta64[ns]")
+        distances[found] = distances_ns[found]
+
+        return pd.Series(prices, index=whens), pd.Series(distances, index=whens)
 
     @staticmethod
     def create_empty() -> "GroupedCandleUniverse":
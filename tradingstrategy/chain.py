@@ -15,78 +15,145 @@ import enum
 import json
 import os
 import threading
+from dataclasses import dataclass
+from functools import lru_cache, cached_property
 from typing import Dict, Optional
 
-#: In-process cached chain data, so we do not need to hit FS every time we access
-_chain_data: Dict[int, dict] = {}
+try:
+    # Optional faster JSON parser
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-#: Slug to chain id mapping
-_slug_map: Dict[str, int] = {}
+#: Where the EIP-155 chain data JSON files of `chains` submodule live
+_CHAIN_DATA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "chains", "_data", "chains"))
+
+#: Slug to chain id mapping.
+#:
+#: Built lazily on the first :py:meth:`ChainId.get_by_slug` call.
+_slug_map: Dict[str, "ChainId"] = {}
 
 
 class ChainDataDoesNotExist(Exception):
     """Cannot find data for a specific chain"""
 
 
-#: Prevent _ensure_chain_data_lazy_init() duplicates
+#: Prevent _get_slug_map() duplicate initialisation
 #:
 #: May happen in Dash application due to hot code reload
 _init_lock = threading.Lock()
 
 
-def _ensure_chain_data_lazy_init():
+@lru_cache(maxsize=None)
+def _check_chain_data_folder():
+    """Check that the chains submodule is in place.
 
-    global _chain_data
-    global _slug_map
+    Done only once per process.
+    """
+    if not os.path.isdir(_CHAIN_DATA_PATH):
+        raise RuntimeError(f"Chain data folder {_CHAIN_DATA_PATH} not found. Make sure you have initialised git submodules or Python packaking is correct.\nHint: git submodule update --recursive --init")
 
-    with _init_lock:
 
-        if _chain_data:
-            # Already initialized
-            return
+@lru_cache(maxsize=None)
+def _load_chain(chain_id: int) -> dict:
+    """Load chain data for a single chain.
 
-        for chain_id in ChainId:
-            chain_id = chain_id.value
-            path = os.path.abspath(os.path.join(os.path.dirname(__file__), "chains", "_data", "chains"))
-            if not os.path.exists(path):
-                raise RuntimeError(f"Chain data folder {path} not found. Make sure you have initialised git submodules or Python packaking is correct.\nHint: git submodule update --recursive --init")
+    The JSON file is parsed only when the chain is accessed the first time,
+    so chains we never touch never hit the file system.
+    The result is cached in-process.
+    """
 
-            # Ganache does not have chain data entry
-            dataless = _CHAIN_DATA_OVERRIDES.get(chain_id, {}).get("dataless", False)
+    overrides = _CHAIN_DATA_OVERRIDES.get(chain_id)
 
-            if not dataless:
+    # Ganache does not have chain data entry
+    if overrides and overrides.get("dataless", False):
+        # Copy, so callers cannot modify our overrides
+        return dict(overrides)
 
-                data_file = os.path.join(path, f"eip155-{chain_id}.json")
-                if not os.path.exists(data_file):
-                    raise ChainDataDoesNotExist(f"Chain data does not exist: {data_file}")
+    _check_chain_data_folder()
 
-                with open(data_file, "rt") as inp:
-                    _chain_data[chain_id] = json.load(inp)
+    data_file = os.path.join(_CHAIN_DATA_PATH, f"eip155-{chain_id}.json")
 
+    # Binary mode skips the text decoding layer, json handles UTF-8 bytes natively.
+    # Let open() tell us if the file is missing instead of a separate stat call.
+    try:
+        with open(data_file, "rb") as inp:
+            if HAS_ORJSON:
+                data = orjson.loads(inp.read())
             else:
+                data = json.load(inp)
+    except FileNotFoundError as e:
+        raise ChainDataDoesNotExist(f"Chain data does not exist: {data_file}") from e
+
+    # Apply our own chain data records
+    if overrides:
+        return data | overrides
+
+    return data
 
-                _chain_data[chain_id] = {}
 
-            # Apply our own chain data records
-            _chain_data[chain_id].update(_CHAIN_DATA_OVERRIDES.get(chain_id, {}))
+def _get_chain_data(chain_id: int) -> dict:
+    assert isinstance(chain_id, int), f"Got chain_id {type(chain_id)}"
+    # ChainId members are ints, normalise so they share the cache entry
+    return _load_chain(int(chain_id))
 
-        # Build slug -> chain id reverse mapping
-        for chain_id, data in _chain_data.items():
-            _slug_map[data["slug"]] = chain_id
 
+def _get_slug_map() -> Dict[str, "ChainId"]:
 
-def _get_chain_data(chain_id: int):
-    assert type(chain_id) == int, f"Got chain_id {type(chain_id)}"
-    _ensure_chain_data_lazy_init()
-    assert chain_id in _chain_data, f"Available chains: {_chain_data.keys()}"
-    return _chain_data[chain_id]
+    if _slug_map:
+        return _slug_map
 
+    with _init_lock:
+        if not _slug_map:
+            # Build slug -> chain id reverse mapping,
+            # publish only a fully built map
+            slug_map = {_get_chain_data(chain_id)["slug"]: chain_id for chain_id in ChainId}
+            _slug_map.update(slug_map)
 
-def _get_slug_map() -> Dict[str, int]:
-    _ensure_chain_data_lazy_init()
     return _slug_map
 
 
+@dataclass(frozen=True, slots=True)
+class ChainMeta:
+    """Frozen metadata of a blockchain.
+
+    Extracted once from the raw chain data dict,
+    see :py:attr:`ChainId.meta`.
+    """
+
+    #: Human readable name
+    name: str
+
+    #: URL slug
+    slug: str
+
+    #: Homepage link.
+    #:
+    #: `None` for test chains without chain data.
+    homepage: Optional[str]
+
+    #: SVG icon link
+    svg_icon: Optional[str]
+
+    #: Blockchain explorer landing page.
+    #:
+    #: `None` for test chains without chain data.
+    explorer: Optional[str]
+
+    @staticmethod
+    def from_data(data: dict) -> "ChainMeta":
+        """Create metadata from chain data dict with our overrides applied."""
+        explorers = data.get("explorers")
+        return ChainMeta(
+            name=data["name"],
+            slug=data["slug"],
+            homepage=data.get("infoURL"),
+            svg_icon=data.get("svg_icon"),
+            explorer=explorers[0]["url"] if explorers else None,
+        )
+
+
 class ChainId(enum.IntEnum):
     """Chain ids and chain metadata helper.
 
@@ -166,32 +233,41 @@ class ChainId(enum.IntEnum):
     #: See https://github.com/ethereum/eth-tester/blob/84378ee7eb714633fbb3169378812ccfcbbd495a/eth_tester/backends/pyevm/main.py#L197
     ethereum_tester = 131277322940537
 
-    @property
+    @cached_property
     def data(self) -> dict:
-        """Get chain data entry for this chain."""
-        return _get_chain_data(self.value)
+        """Get chain data entry for this chain.
+
+        Resolved once and then memoized on the enum member.
+        """
+        return _get_chain_data(self)
+
+    @cached_property
+    def meta(self) -> ChainMeta:
+        """Get frozen metadata for this chain.
+
+        Resolved once and then memoized on the enum member.
+        """
+        return ChainMeta.from_data(self.data)
 
     def get_name(self) -> str:
         """Get full human readab name for this blockchain"""
-        return self.data["name"]
+        return self.meta.name
 
     def get_slug(self) -> str:
         """Get URL slug for this chain"""
-        return self.data["slug"]
+        return self.meta.slug
 
-    def get_homepage(self) -> str:
+    def get_homepage(self) -> Optional[str]:
         """Get homepage link for this blockchain"""
+        return self.meta.homepage
 
-        # TODO: Use chain id JSON data in the future
-        return self.data["infoURL"]
-
-    def get_svg_icon_link(self) -> str:
+    def get_svg_icon_link(self) -> Optional[str]:
         """Get an absolute SVG image link to a chain icon, transparent background"""
-        return self.data["svg_icon"]
+        return self.meta.svg_icon
 
-    def get_explorer(self) -> str:
+    def get_explorer(self) -> Optional[str]:
         """Get explorer landing page for this blockchain"""
-        return self.data["explorers"][0]["url"]
+        return self.meta.explorer
 
     def get_address_link(self, address) -> str:
         """Get one address link.
@@ -200,11 +276,15 @@ class ChainId(enum.IntEnum):
 
         https://eips.ethereum.org/EIPS/eip-3091
         """
-        return f"{self.get_explorer()}/address/{address}"
+        explorer = self.meta.explorer
+        assert explorer, f"No blockchain explorer for {self.name}"
+        return f"{explorer}/address/{address}"
 
     def get_tx_link(self, tx) -> str:
         """Get one tx link"""
-        return f"{self.get_explorer()}/tx/{tx}"
+        explorer = self.meta.explorer
+        assert explorer, f"No blockchain explorer for {self.name}"
+        return f"{explorer}/tx/{tx}"
 
     @staticmethod
     def get_by_slug(slug: str) -> Optional["ChainId"]:
@@ -212,11 +292,7 @@ class ChainId(enum.IntEnum):
 
         Most useful for resolving URLs.
         """
-        slug_map = _get_slug_map()
-        chain_id_value = slug_map.get(slug)
-        if chain_id_value is None:
-            return None
-        return ChainId(chain_id_value)
+        return _get_slug_map().get(slug)
 
 
 #: Override stuff we do not like in Chain data repo
@@ -1,9 +1,11 @@
+import threading
 from dataclasses import dataclass
-from typing import List, Iterable
+from typing import List, Iterable, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from tradingstrategy.direct_feed.ohlcv_aggregate import resample_trades_into_ohlcv, get_feed_for_pair, truncate_ohlcv
+from tradingstrategy.direct_feed.ohlcv_aggregate import resample_trades_into_ohlcv
 from tradingstrategy.direct_feed.timeframe import Timeframe
 from tradingstrategy.direct_feed.trade_feed import TradeDelta
 from tradingstrategy.direct_feed.direct_feed_pair import PairId
@@ -41,14 +43,19 @@ class CandleFeed:
             assert type(p) == str, f"Pairs must be a list of pair ids (str). Got: {p}"
         self.pairs = pairs
         self.timeframe = timeframe
-        self.candle_df = pd.DataFrame()
         self.last_cycle = 0
 
+        self._init_storage()
+
+        #: (storage snapshot, candles) of the last :py:attr:`candle_df` build
+        self._candle_df_cache: Tuple[Optional[dict], pd.DataFrame] = (None, pd.DataFrame())
+
     def __repr__(self):
+        class_name = self.__class__.__name__
         if len(self.pairs) == 1:
-            name = f"CandleFeed for {self.pairs[0]}"
+            name = f"{class_name} for {self.pairs[0]}"
         else:
-            name = f"CandleFeed for {len(self.pairs)} pairs"
+            name = f"{class_name} for {len(self.pairs)} pairs"
 
         if len(self.candle_df) > 0:
             first_ts = self.candle_df.iloc[0]["timestamp"]
@@ -60,6 +67,123 @@ class CandleFeed:
 
         return f"<{name} using timeframe {self.timeframe.freq}, having data {first_ts} - {last_ts} total {candle_count:,} candles>"
 
+    @property
+    def candle_df(self) -> pd.DataFrame:
+        """All candles for all pairs.
+
+        Indexed by (pair, timestamp).
+        Built lazily from the per-pair candles
+        and cached until the next :py:meth:`apply_delta`.
+        """
+        per_pair = self._per_pair
+        snapshot, candle_df = self._candle_df_cache
+        if snapshot is not per_pair:
+            pairs = sorted(per_pair)
+            if len(pairs) == 0:
+                candle_df = pd.DataFrame()
+            elif len(pairs) == 1:
+                # No need to concat, only add the pair level to the index
+                pair = pairs[0]
+                candles = self._get_pair_frame(pair, per_pair[pair])
+                candle_df = candles.copy(deep=False)
+                candle_df.index = pd.MultiIndex.from_arrays(
+                    [np.full(len(candles), pair, dtype=object), candles.index],
+                    names=["pair", candles.index.name],
+                )
+            else:
+                candle_df = pd.concat(
+                    [self._get_pair_frame(p, per_pair[p]) for p in pairs],
+                    keys=pairs,
+                    names=["pair"],
+                    copy=False,
+                )
+            self._candle_df_cache = (per_pair, candle_df)
+        return candle_df
+
+    def _init_storage(self):
+        """Set up the empty per-pair candle storage."""
+
+        #: Pair -> candle chunks of the pair, in the time order.
+        #: Each chunk is indexed by timestamp.
+        #:
+        #: Never modified in place. :py:meth:`apply_delta` builds a new dict
+        #: and swaps it in with one assignment, so readers in other threads
+        #: always see a consistent snapshot.
+        self._per_pair: Dict[PairId, Tuple[pd.DataFrame, ...]] = {}
+
+        #: Pair -> (chunks, candles) of the last concat of the pair chunks
+        self._pair_frames: Dict[PairId, Tuple[Tuple[pd.DataFrame, ...], pd.DataFrame]] = {}
+
+    def _get_pair_frame(self, pair: PairId, chunks: Tuple[pd.DataFrame, ...]) -> pd.DataFrame:
+        """Get timestamp indexed candles of a pair.
+
+        Chunks are concatenated only when someone asks for the data,
+        and the result is cached until the pair gets new candles.
+        """
+        cached = self._pair_frames.get(pair)
+        if cached is not None and cached[0] is chunks:
+            return cached[1]
+
+        if len(chunks) == 1:
+            candles = chunks[0]
+        else:
+            candles = pd.concat(chunks, copy=False)
+
+        self._pair_frames[pair] = (chunks, candles)
+        return candles
+
+    def _truncate_pair(self, pair: PairId, chunks: Tuple[pd.DataFrame, ...], ts: pd.Timestamp) -> Optional[Tuple[pd.DataFrame, ...]]:
+        """Drop candles at or after the timestamp.
+
+        Chunks are in the time order, so only the tail chunks
+        can be affected. Rows within a chunk are sorted by timestamp,
+        so we can binary search the cut point on the raw int64 timestamps.
+
+        :return:
+            Remaining chunks or ``None`` if no candles are left
+        """
+        ts_value = ts.value
+        remaining = list(chunks)
+        while remaining:
+            last_chunk = remaining[-1]
+            cut = np.searchsorted(last_chunk.index.asi8, ts_value, side="left")
+            if cut == len(last_chunk):
+                # Nothing to drop
+                break
+
+            remaining.pop()
+
+            if cut > 0:
+                # This was the boundary chunk
+                remaining.append(last_chunk.iloc[:cut])
+                break
+
+        if len(remaining) == len(chunks) and remaining[-1] is chunks[-1]:
+            # Keep the same tuple, so the cached concat stays valid
+            return chunks
+
+        return tuple(remaining) or None
+
+    def _append_pair(self, pair: PairId, chunks: Optional[Tuple[pd.DataFrame, ...]], candles: pd.DataFrame) -> Tuple[pd.DataFrame, ...]:
+        """Add newly resampled candles of a pair.
+
+        :param chunks:
+            Existing chunks of the pair or ``None``
+
+        :param candles:
+            Timestamp indexed candles of the pair, in the time order
+        """
+        if chunks is None:
+            return (candles,)
+
+        # Collapse the chunks somebody has already concatenated,
+        # so we do not concat the same history again on the next read
+        cached = self._pair_frames.get(pair)
+        if cached is not None and cached[0] is chunks:
+            chunks = (cached[1],)
+
+        return chunks + (candles,)
+
     def apply_delta(self, delta: TradeDelta, initial_load=False, label_candles=True):
         """Add new candle data generated from the latest blockchain input.
 
@@ -81,19 +205,49 @@ class CandleFeed:
 
         if len(delta.trades) > 0:
 
-            cropped_df = truncate_ohlcv(self.candle_df, delta.start_ts)
-
             candles = resample_trades_into_ohlcv(delta.trades, self.timeframe)
 
             # Only if we have any new candles from our timeframe add them to the
             # in-memory buffer
             if len(candles) > 0:
-                self.candle_df = pd.concat([cropped_df, candles])
+                per_pair = {}
+                for pair, storage in self._per_pair.items():
+                    storage = self._truncate_pair(pair, storage, delta.start_ts)
+                    if storage is not None:
+                        per_pair[pair] = storage
+
+                for pair, new_candles in candles.groupby(level="pair", sort=False):
+                    per_pair[pair] = self._append_pair(pair, per_pair.get(pair), new_candles.droplevel("pair"))
+
+                # Publish with a single assignment,
+                # so readers never see a half updated dict
+                self._per_pair = per_pair
 
         self.last_cycle = delta.cycle
 
     def get_candles_by_pair(self, pair: PairId) -> pd.DataFrame:
-        return get_feed_for_pair(self.candle_df, pair)
+        """Get candles for a single pair.
+
+        :return:
+            Candles indexed by timestamp.
+            Empty dataframe if the feed has no data yet.
+
+        :raise KeyError:
+            If we do not have data for the pair
+        """
+
+        per_pair = self._per_pair
+
+        # No data, return empty dataframe
+        if not per_pair:
+            return pd.DataFrame()
+
+        try:
+            storage = per_pair[pair]
+        except KeyError as e:
+            raise KeyError(f"Could not find pair for address {pair}") from e
+
+        return self._get_pair_frame(pair, storage)
 
     def get_last_block_number(self) -> int:
         """Get overall last block number for which we have valid data.
@@ -101,7 +255,9 @@ class CandleFeed:
         :return:
             block number (inclusive)
         """
-        return self.candle_df["end_block"].max()
+        per_pair = self._per_pair
+        assert per_pair, "Candle feed does not have data yet"
+        return max(self._get_pair_frame(pair, storage)["end_block"].max() for pair, storage in per_pair.items())
 
     def iterate_pairs(self) -> Iterable[pd.DataFrame]:
         """Get candles for all pairs we are tracking."""
@@ -109,6 +265,185 @@ class CandleFeed:
             yield self.get_candles_by_pair(p)
 
 
+class CandleRingBuffer:
+    """Fixed capacity candle storage for a single pair.
+
+    - Candles are kept in preallocated NumPy arrays,
+      one array per column
+
+    - Once the buffer is full, the oldest candles are overwritten,
+      so appending candles does not reallocate anything
+
+    - After a chain reorganisation truncates the latest candles,
+      the buffer holds fewer than `capacity` candles until new ones arrive
+
+    - Safe to read from another thread while the buffer is being updated
+
+    - Columns and their order are the same as :py:func:`resample_trades_into_ohlcv` gives.
+      Open, high, low, close and volume are stored as `float32`,
+      like :py:func:`prepare_raw_candle_data` does.
+      Other columns keep their `resample_trades_into_ohlcv` dtypes.
+    """
+
+    #: Column name -> storage dtype, in the output column order.
+    #:
+    #: `timestamp` is stored separately and goes after `close`.
+    COLUMNS = {
+        "open": "float32",
+        "high": "float32",
+        "low": "float32",
+        "close": "float32",
+        "exchange_rate": "float64",
+        "start_block": "float64",
+        "end_block": "float64",
+        "volume": "float32",
+        "avg_trade": "float64",
+        "buys": "int64",
+        "sells": "int64",
+    }
+
+    def __init__(self, capacity: int):
+        """
+        :param capacity:
+            How many latest candles we keep
+        """
+        assert capacity > 0, f"Got capacity {capacity}"
+        self.capacity = capacity
+
+        #: Candle timestamps as UNIX nanoseconds
+        self.timestamps = np.empty(capacity, dtype=np.int64)
+
+        #: Column name -> column data
+        self.columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in self.COLUMNS.items()}
+
+        #: Physical slot where the next candle is written
+        self.head = 0
+
+        #: Number of valid candles in the buffer
+        self.count = 0
+
+        #: Cached output of :py:meth:`to_frame`
+        self._frame: pd.DataFrame | None = None
+
+        #: Readers must not see half written arrays
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.count
+
+    def truncate(self, ts: pd.Timestamp):
+        """Drop candles at or after the timestamp.
+
+        Chain reorganisations only affect the latest candles,
+        so we walk back from the newest candle.
+        """
+        ts_value = ts.value
+        with self._lock:
+            while self.count > 0:
+                last = (self.head - 1) % self.capacity
+                if self.timestamps[last] < ts_value:
+                    break
+                self.head = last
+                self.count -= 1
+                self._frame = None
+
+    def append(self, candles: pd.DataFrame):
+        """Write new candles to the buffer, overwriting the oldest ones if full.
+
+        :param candles:
+            Timestamp indexed candles of this pair, in the time order
+        """
+        timestamps = candles.index.asi8
+        if len(timestamps) > self.capacity:
+            candles = candles.iloc[-self.capacity:]
+            timestamps = timestamps[-self.capacity:]
+
+        new_columns = {name: candles[name].to_numpy(dtype=column.dtype) for name, column in self.columns.items()}
+
+        with self._lock:
+            slots = (self.head + np.arange(len(timestamps))) % self.capacity
+            self.timestamps[slots] = timestamps
+            for name, column in self.columns.items():
+                column[slots] = new_columns[name]
+
+            self.head = (self.head + len(timestamps)) % self.capacity
+            self.count = min(self.count + len(timestamps), self.capacity)
+            self._frame = None
+
+    def to_frame(self) -> pd.DataFrame:
+        """Get the buffer content as a timestamp indexed DataFrame.
+
+        Built lazily and cached until the buffer is modified.
+        """
+        with self._lock:
+            if self._frame is None:
+                slots = (self.head - self.count + np.arange(self.count)) % self.capacity
+                timestamps = pd.DatetimeIndex(self.timestamps[slots].view("datetime64[ns]"), name="timestamp")
+                data = {}
+                for name, column in self.columns.items():
+                    data[name] = column[slots]
+                    if name == "close":
+                        data["timestamp"] = timestamps
+                self._frame = pd.DataFrame(data, index=timestamps)
+            return self._frame
+
+
+class RingBufferCandleFeed(CandleFeed):
+    """Candle feed that keeps only a fixed number of the latest candles per pair.
+
+    - Each pair has its own :py:class:`CandleRingBuffer`
+
+    - Once the buffers are full, :py:meth:`apply_delta` does not
+      reallocate candle data
+
+    - Use for live trading and charting where you need a rolling
+      window of candles instead of the full history
+
+    - Open, high, low, close and volume are `float32`,
+      see :py:class:`CandleRingBuffer`
+    """
+
+    def __init__(self,
+                 pairs: List[PairId],
+                 timeframe: Timeframe,
+                 capacity: int,
+                 ):
+        """
+
+        :param pairs:
+            List of pairs this address contains.
+
+            Symbolic names or addresses.
+
+        :param capacity:
+            How many latest candles to keep per pair
+        """
+        self.capacity = capacity
+        super().__init__(pairs, timeframe)
+
+    def _init_storage(self):
+        #: Pair -> candle ring buffer of the pair.
+        #:
+        #: Swapped as a whole in :py:meth:`apply_delta`,
+        #: the ring buffers themselves are updated in place.
+        self._per_pair: Dict[PairId, CandleRingBuffer] = {}
+
+    def _get_pair_frame(self, pair: PairId, ring: CandleRingBuffer) -> pd.DataFrame:
+        return ring.to_frame()
+
+    def _truncate_pair(self, pair: PairId, ring: CandleRingBuffer, ts: pd.Timestamp) -> Optional[CandleRingBuffer]:
+        ring.truncate(ts)
+        if len(ring) == 0:
+            return None
+        return ring
+
+    def _append_pair(self, pair: PairId, ring: Optional[CandleRingBuffer], candles: pd.DataFrame) -> CandleRingBuffer:
+        if ring is None:
+            ring = CandleRingBuffer(self.capacity)
+        ring.append(candles)
+        return ring
+
+
 def prepare_raw_candle_data(df: pd.DataFrame) -> pd.DataFrame:
     """Convert all Python Decimal objects to easier to deal floats in DataFrame."""
     return df.astype({
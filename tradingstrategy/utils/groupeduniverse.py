@@ -73,7 +73,9 @@ class PairGroupedUniverse:
         if fix_wick_threshold:
             self.df = fix_bad_wicks(self.df, fix_wick_threshold)
 
-        self.pairs: pd.GroupBy = self.df.groupby(["pair_id"])
+        # observed=True: do not generate empty groups
+        # if the grouper is categorical
+        self.pairs: pd.GroupBy = self.df.groupby(self.get_pair_grouper(), observed=True)
 
         self.timestamp_column = timestamp_column
         self.time_bucket = time_bucket
@@ -81,6 +83,13 @@ class PairGroupedUniverse:
         self.candles_cache: dict[int, pd.DataFrame] = {}
 
 
+    def get_pair_grouper(self) -> list | pd.Categorical:
+        """What we group the samples by to get per-pair data.
+
+        Subclasses may give a precomputed key instead of the column name.
+        """
+        return ["pair_id"]
+
     def get_columns(self) -> pd.Index:
         """Get column names from the underlying pandas.GroupBy object"""
         return self.pairs.obj.columns
@@ -344,9 +353,18 @@ class PairGroupedUniverse:
         # Get all df content before our timestamp
         if timestamp:
             if allow_current:
-                df = df.truncate(after=timestamp + pd.Timedelta(seconds=1))
+                after = timestamp + pd.Timedelta(seconds=1)
+            else:
+                after = timestamp - pd.Timedelta(seconds=1)
+
+            if isinstance(df.index, pd.DatetimeIndex) and df.index.is_monotonic_increasing:
+                # Binary search on raw int64 timestamps, avoids
+                # label based slice_locs() in truncate().
+                # Unsorted indexes go to truncate(), which refuses them.
+                cut = np.searchsorted(df.index.asi8, pd.Timestamp(after).value, side="right")
+                df = df.iloc[:cut]
             else:
-                df = df.truncate(after=timestamp - pd.Timedelta(seconds=1))
+                df = df.truncate(after=after)
 
         if sample_count:
             return df.iloc[-sample_count:]